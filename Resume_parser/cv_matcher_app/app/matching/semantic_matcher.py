@@ -1,13 +1,222 @@
-import shap
+import os
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Add this line to avoid GUI issues
-import matplotlib.pyplot as plt
+import torch
 import io
 import base64
+import hashlib
+import shutil
+import tempfile
+import threading
+import warnings
+from collections import OrderedDict
+from functools import lru_cache
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from wordcloud import WordCloud
+
+
+# One reusable figure for the SHAP bar chart; created outside pyplot so it is never
+# registered with a GUI backend. The lock keeps concurrent Streamlit sessions apart.
+_SHAP_FIG = None
+_SHAP_AX = None
+_SHAP_LOCK = threading.Lock()
+
+
+def _shap_axes():
+    """Return the shared SHAP figure and axes, importing matplotlib on first use (hold _SHAP_LOCK)."""
+    global _SHAP_FIG, _SHAP_AX
+    if _SHAP_FIG is None:
+        from matplotlib.figure import Figure
+        _SHAP_FIG = Figure()
+        _SHAP_AX = _SHAP_FIG.add_subplot()
+    return _SHAP_FIG, _SHAP_AX
+
+
+# Punctuation treated as a word separator when tokenizing sections for keywords
+_PUNCT_TO_SPACE = str.maketrans(',;:()', '     ')
+
+
+@lru_cache(maxsize=64)
+def _render_word_cloud(keywords: tuple[str, ...]) -> str:
+    """Render keywords straight to a base64 PNG via PIL, memoized per keyword set."""
+    from wordcloud import WordCloud  # imported lazily to keep app start-up fast
+    wc = WordCloud(width=800, height=400, background_color='white').generate(' '.join(keywords))
+    buf = io.BytesIO()
+    wc.to_image().save(buf, format='PNG')
+    return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+
+class OnnxEncoder:
+    """
+    Runs a sentence-transformer through ONNX Runtime after an O99 (fusion + layout) optimisation pass.
+    The model is exported and optimised once into `export_dir` and loaded from there afterwards.
+    Mirrors the subset of SentenceTransformer.encode used here (mean pooling + L2 normalisation).
+    Requires the optional `optimum[onnxruntime]` package.
+    """
+
+    OPTIMIZED_FILE = 'model_optimized.onnx'
+
+    def __init__(self, model_name: str, max_length: int = 256, export_dir: str = '.onnx_models'):
+        from optimum.onnxruntime import ORTModelForFeatureExtraction
+        from transformers import AutoTokenizer
+
+        hub_name = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+        model_dir = os.path.join(export_dir, hub_name.replace('/', '__') + '-O99')
+        if not os.path.exists(os.path.join(model_dir, self.OPTIMIZED_FILE)):
+            self._export(hub_name, export_dir, model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, file_name=self.OPTIMIZED_FILE, provider='CPUExecutionProvider'
+        )
+        self.max_length = max_length
+
+    @staticmethod
+    def _export(hub_name: str, export_dir: str, model_dir: str):
+        """Export to ONNX, apply the O99 optimisation and move the result into `model_dir`."""
+        from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTOptimizer
+        from optimum.onnxruntime.configuration import OptimizationConfig
+        from transformers import AutoTokenizer
+
+        os.makedirs(export_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(dir=export_dir)
+        try:
+            model = ORTModelForFeatureExtraction.from_pretrained(hub_name, export=True)
+            ORTOptimizer.from_pretrained(model).optimize(
+                save_dir=tmp_dir, optimization_config=OptimizationConfig(optimization_level=99)
+            )
+            AutoTokenizer.from_pretrained(hub_name).save_pretrained(tmp_dir)
+            if os.path.exists(os.path.join(model_dir, OnnxEncoder.OPTIMIZED_FILE)):
+                return  # another process finished the export first; keep theirs
+            shutil.rmtree(model_dir, ignore_errors=True)  # drop a partial export
+            try:
+                os.replace(tmp_dir, model_dir)
+            except OSError:
+                # Lost a race with a concurrent export; fine as long as it completed
+                if not os.path.exists(os.path.join(model_dir, OnnxEncoder.OPTIMIZED_FILE)):
+                    raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def encode(self, texts: list[str], batch_size: int = 32, normalize_embeddings: bool = True,
+               convert_to_numpy: bool = True) -> np.ndarray:
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=True,
+                max_length=self.max_length, return_tensors='np'
+            )
+            hidden = np.asarray(self.session(**inputs).last_hidden_state)
+            mask = inputs['attention_mask'][..., None].astype(hidden.dtype)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            if normalize_embeddings:
+                pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            chunks.append(pooled)
+        return np.vstack(chunks)
+
+
+class CachedEmbedder:
+    """
+    Wraps a SentenceTransformer and memoizes normalized embeddings keyed by sha1(model_name, backend, text).
+    Keeps an in-memory LRU of `max_size` entries and optionally mirrors it to a diskcache store.
+    Uses an ONNX Runtime session (FP32) when `use_onnx` is set and the ONNX model can be loaded;
+    otherwise the PyTorch model, which `quantize` runs in FP16 on GPU or with dynamic int8 Linear
+    layers on CPU. `quantize` is ignored on the ONNX path, so scores differ slightly between the two.
+    Passing `num_threads` calls torch.set_num_threads, which changes torch state for the whole process.
+    """
+
+    def __init__(self, model_name: str, max_size: int = 2048, cache_dir: str | None = None,
+                 quantize: bool = True, use_onnx: bool = True, num_threads: int | None = None):
+        self.model_name = model_name
+        self.model = None
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        if use_onnx and not torch.cuda.is_available():
+            try:
+                self.model = OnnxEncoder(model_name)
+                self.backend = 'onnx-o99-fp32'
+            except ImportError:
+                self.model = None  # optimum/onnxruntime are optional; fall back to PyTorch
+            except Exception as exc:
+                warnings.warn(f"ONNX backend unavailable ({exc!r}); falling back to PyTorch")
+                self.model = None
+        if self.model is None:
+            self.model = SentenceTransformer(model_name)
+            self.backend = 'torch-fp32'
+            if quantize:
+                self.model = self._quantize(self.model)
+                self.backend = 'torch-fp16-cuda' if torch.cuda.is_available() else 'torch-int8'
+            self.model.eval()
+        # Warm up so the first real request doesn't pay one-off initialisation cost
+        with torch.inference_mode():
+            self.model.encode(["warmup"])
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        # The scorer is shared by all Streamlit sessions, so guard the LRU bookkeeping
+        self._lock = threading.Lock()
+        self._disk = None
+        if cache_dir:
+            try:
+                from diskcache import Cache
+                self._disk = Cache(cache_dir)
+            except ImportError:
+                self._disk = None  # diskcache is optional; fall back to memory only
+
+    @staticmethod
+    def _quantize(model: SentenceTransformer) -> SentenceTransformer:
+        if torch.cuda.is_available():
+            return model.half().to('cuda')
+        model[0].auto_model = torch.quantization.quantize_dynamic(
+            model[0].auto_model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        return model
+
+    def _key(self, text: str) -> str:
+        # Include the backend so vectors from differently quantized models never mix
+        return hashlib.sha1(f'{self.model_name}|{self.backend}|{text}'.encode('utf-8')).hexdigest()
+
+    def _lookup(self, key: str):
+        with self._lock:
+            emb = self._cache.get(key)
+            if emb is not None:
+                self._cache.move_to_end(key)
+                return emb
+        if self._disk is not None:
+            emb = self._disk.get(key)
+            if emb is not None:
+                self._remember(key, emb)
+                return emb
+        return None
+
+    def _remember(self, key: str, emb: np.ndarray):
+        with self._lock:
+            self._cache[key] = emb
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        """
+        Return a (len(texts), dim) array of normalized embeddings.
+        Cache misses are encoded together in a single batched call.
+        """
+        keys = [self._key(text) for text in texts]
+        found = {key: self._lookup(key) for key in set(keys)}
+        missing = {key for key, emb in found.items() if emb is None}
+
+        if missing:
+            miss_texts = {key: text for key, text in zip(keys, texts) if key in missing}
+            with torch.inference_mode():
+                embs = self.model.encode(
+                    list(miss_texts.values()),
+                    batch_size=len(miss_texts),
+                    normalize_embeddings=True,
+                    convert_to_numpy=True
+                )
+            for key, emb in zip(miss_texts.keys(), embs):
+                found[key] = emb
+                self._remember(key, emb)
+                if self._disk is not None:
+                    self._disk.set(key, emb)
+
+        return np.vstack([found[key] for key in keys])
 
 
 class SemanticScorer:
@@ -18,9 +227,10 @@ class SemanticScorer:
 
     SECTIONS = ['skills', 'experience', 'education']
 
-    def __init__(self):
-        # Load a lightweight sentence-transformer model
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+    def __init__(self, cache_dir: str | None = None, num_threads: int | None = None):
+        # Load a lightweight sentence-transformer model behind an embedding cache
+        self.embedder = CachedEmbedder('all-MiniLM-L6-v2', cache_dir=cache_dir, num_threads=num_threads)
+        self.model = self.embedder.model
         # Section weights must sum to 1.0
         self.weights = {
             'skills': 0.4,
@@ -30,44 +240,56 @@ class SemanticScorer:
         }
         if not np.isclose(sum(self.weights.values()), 1.0):
             raise ValueError("The weights must sum to 1.0")
+        # Weight vector aligned with SECTIONS, built once for the vectorized scoring paths
+        self._w = np.array([self.weights.get(sec, 0) for sec in self.SECTIONS])
 
     def embed(self, text: str):
         """
-        Generate a normalized sentence embedding for the given text.
+        Generate a normalized 1-D sentence embedding for the given text.
         """
         text = text.strip() if text else ""
-        return self.model.encode([text], normalize_embeddings=True)
+        return self.embedder.encode([text])[0].ravel()
+
+    def embed_sections(self, cv: dict, jd: dict):
+        """
+        Embed every CV and JD section in a single batched encode call (cached sections are skipped).
+        Returns a (cv_embs, jd_embs) pair, each with one row per section in SECTIONS order.
+        """
+        texts = [(cv.get(sec) or '').strip() for sec in self.SECTIONS]
+        texts += [(jd.get(sec) or '').strip() for sec in self.SECTIONS]
+        embs = self.embedder.encode(texts)
+        n = len(self.SECTIONS)
+        return embs[:n], embs[n:]
 
     def get_similarity(self, emb1, emb2) -> float:
         """
         Compute cosine similarity between two embedding vectors.
+        Embeddings are already L2-normalized, so this is a plain dot product.
         Returns a float between -1 and 1.
         """
-        return float(cosine_similarity(emb1, emb2)[0][0])
+        return float(np.dot(np.asarray(emb1).ravel(), np.asarray(emb2).ravel()))
+
+    def section_similarities(self, cv: dict, jd: dict) -> np.ndarray:
+        """
+        Compute the cosine similarity of every CV section against its JD counterpart.
+        Returns a 1-D array with one similarity per section in SECTIONS order.
+        """
+        cv_embs, jd_embs = self.embed_sections(cv, jd)
+        return np.einsum('ij,ij->i', cv_embs, jd_embs)
 
     def score_cv(self, cv: dict, jd: dict) -> dict:
         """
         Score each section of the CV against the JD and return detailed metrics.
         Returns a dict with section-wise similarities, best match, and total weighted score.
         """
-        section_scores = {}
-        total_score = 0.0
-        best_match_score = -1.0
-        best_match_section = ''
-
-        # Precompute embeddings for CV and JD sections
-        cv_embeds = {sec: self.embed(cv.get(sec, '')) for sec in self.SECTIONS}
-        jd_embeds = {sec: self.embed(jd.get(sec, '')) for sec in self.SECTIONS}
+        # Embed all CV and JD sections in one forward pass and compare them row-wise
+        sims = self.section_similarities(cv, jd)
+        section_scores = {f"{sec}_similarity": float(sim) for sec, sim in zip(self.SECTIONS, sims)}
 
-        # Compute similarity per section
-        for sec in self.SECTIONS:
-            sim = self.get_similarity(cv_embeds[sec], jd_embeds[sec])
-            section_scores[f"{sec}_similarity"] = sim
-            weighted_score = sim * 100 * self.weights.get(sec, 0)
-            total_score += weighted_score
-            if sim > best_match_score:
-                best_match_score = sim
-                best_match_section = sec
+        total_score = float(sims @ self._w) * 100
+        best_idx = int(sims.argmax())
+        best_match_score = float(sims[best_idx])
+        best_match_section = self.SECTIONS[best_idx]
 
         # Aggregate results
         section_scores.update({
@@ -84,8 +306,8 @@ class SemanticScorer:
         """
         missing = set()
         for sec in self.SECTIONS:
-            cv_words = set(cv.get(sec, "").lower().replace(',', ' ').split())
-            jd_words = set(jd.get(sec, "").lower().replace(',', ' ').split())
+            cv_words = set((cv.get(sec) or "").lower().translate(_PUNCT_TO_SPACE).split())
+            jd_words = set((jd.get(sec) or "").lower().translate(_PUNCT_TO_SPACE).split())
             missing |= (jd_words - cv_words)
         return sorted(missing)
 
@@ -97,45 +319,37 @@ class SemanticScorer:
         if not keywords:
             return None
 
-        text = ' '.join(keywords)
-        wc = WordCloud(width=800, height=400, background_color='white').generate(text)
+        return _render_word_cloud(tuple(sorted(keywords)))
 
-        buf = io.BytesIO()
-        plt.figure(figsize=(10, 5))
-        plt.imshow(wc, interpolation='bilinear')
-        plt.axis('off')
-        plt.tight_layout()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        plt.close()
-        buf.seek(0)
-        return base64.b64encode(buf.read()).decode('utf-8')
+    def shap_values(self, sims) -> np.ndarray:
+        """
+        Exact SHAP values of each section similarity for the weighted-sum score.
+        Returns a 1-D array in SECTIONS order.
+        """
+        # The score is linear in the similarities, so SHAP values have a closed form:
+        # phi_i = w_i * (x_i - E[x_i]), with the identity-matrix background used as E[x]
+        baseline = np.eye(len(self.SECTIONS)).mean(axis=0)
+        return self._w * (np.asarray(sims, dtype=float) - baseline)
 
-    def explain_score(self, cv: dict, jd: dict) -> str:
+    def explain_score(self, cv: dict, jd: dict, sims: list[float] | None = None) -> str:
         """
         Use SHAP to explain how each section contributed to the overall score.
+        Pass the section similarities already computed by score_cv as `sims` (SECTIONS order)
+        to skip re-embedding. SHAP values are computed exactly for the linear scoring model.
         Returns a base64-encoded PNG of a SHAP bar chart with real section names.
         """
-        # Compute raw similarities
-        sims = [
-            self.get_similarity(self.embed(cv.get(sec, '')), self.embed(jd.get(sec, '')))
-            for sec in self.SECTIONS
-        ]
-        X = np.array(sims).reshape(1, -1)
-
-        # Define a dummy model that returns the weighted sum
-        def model_predict(data: np.ndarray) -> np.ndarray:
-            w = np.array([self.weights[sec] for sec in self.SECTIONS])
-            return np.sum(data * w, axis=1).reshape(-1, 1)
-
-        # Explain with SHAP, passing feature names for clarity
-        explainer = shap.Explainer(model_predict, np.eye(len(self.SECTIONS)), feature_names=self.SECTIONS)
-        shap_values = explainer(X)
+        if sims is None:
+            sims = self.section_similarities(cv, jd)
+        phi = self.shap_values(sims)
 
         buf = io.BytesIO()
-        plt.figure()
-        shap.plots.bar(shap_values, show=False)
-        plt.tight_layout()
-        plt.savefig(buf, format='png', bbox_inches='tight')
-        plt.close()
-        buf.seek(0)
-        return base64.b64encode(buf.read()).decode('utf-8')
+        with _SHAP_LOCK:
+            fig, ax = _shap_axes()
+            ax.clear()
+            ax.barh(self.SECTIONS, phi, color=['#ff0051' if v >= 0 else '#008bfb' for v in phi])
+            ax.axvline(0, color='grey', linewidth=0.8)
+            ax.set_xlabel('SHAP value (impact on weighted score)')
+            ax.invert_yaxis()
+            fig.tight_layout()
+            fig.savefig(buf, format='png', bbox_inches='tight')
+        return base64.b64encode(buf.getvalue()).decode('utf-8')
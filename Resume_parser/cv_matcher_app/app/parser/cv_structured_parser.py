@@ -1,45 +1,83 @@
 import re
 from datetime import datetime
-import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import pandas as pd
 import io
 import base64
+import threading
+
+# Precompiled patterns
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+')
+PHONE_RE = re.compile(r'(?:\+\d{1,3}[\s-]?)?\d{10,15}')
+GITHUB_RE = re.compile(r'github\.com/\S+', re.IGNORECASE)
+LINKEDIN_RE = re.compile(r'linkedin\.com/\S+', re.IGNORECASE)
+DATE_RANGE_RE = re.compile(
+    r'(?P<start>(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|[A-Za-z]{3,}\.? ?\d{4}|\d{4}[/-]\d{2}))'
+    r'\s*(?:-|–|—|to)\s*'
+    r'(?P<end>(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|Present|Now|[A-Za-z]{3,}\.? ?\d{4}|\d{4}[/-]\d{2}))',
+    re.IGNORECASE
+)
+LABEL_SPLIT_RE = re.compile(r'During|Business|Website|Key|As')
+LEADING_LOWER_RE = re.compile(r'^[a-z]+(?:\s+[a-z]+)*,\s*')
+ROLE_COMPANY_RE = re.compile(r'(?P<role>.+?)\s+at\s+(?P<company>.+)', re.IGNORECASE)
+# Section headers in any case; a trailing suffix ("Educational", "EXPERIENCES", "Skillset")
+# is consumed so the section text starts after the whole word
+HEADER_RE = re.compile(r'\b(Education|Experience|Skills|Projects)\w*', re.IGNORECASE)
+
+# Reusable timeline figure (outside pyplot); the lock serialises concurrent renders
+_TIMELINE_FIG = None
+_TIMELINE_AX = None
+_TIMELINE_LOCK = threading.Lock()
+
+
+def _timeline_axes():
+    """Return the shared timeline figure and axes, creating them on first use (hold _TIMELINE_LOCK)."""
+    global _TIMELINE_FIG, _TIMELINE_AX
+    if _TIMELINE_FIG is None:
+        from matplotlib.figure import Figure
+        _TIMELINE_FIG = Figure(figsize=(14, 6))
+        _TIMELINE_AX = _TIMELINE_FIG.add_subplot()
+    return _TIMELINE_FIG, _TIMELINE_AX
+
+
+def _date_format(s: str) -> str | None:
+    """Pick the single strptime format that can match `s`, based on its shape."""
+    if s[:1].isalpha():
+        # 'Jan 2020' / 'January 2020'
+        return '%b %Y' if len(s.split(' ', 1)[0]) == 3 else '%B %Y'
+    sep = '-' if '-' in s else '/'
+    parts = s.split(sep)
+    if len(parts) == 2:
+        return f'%Y{sep}%m'
+    if len(parts) == 3:
+        return f'%Y{sep}%m{sep}%d' if len(parts[0]) == 4 else f'%d{sep}%m{sep}%Y'
+    return None
 
-# Supported date formats
-date_formats = [
-    '%Y-%m-%d', '%Y/%m/%d',
-    '%Y-%m', '%Y/%m',
-    '%d-%m-%Y', '%d/%m/%Y',
-    '%b %Y', '%B %Y',
-]
 
 def parse_date(date_str: str) -> datetime:
     """Parse different date formats and support 'Present'/'Now'."""
     s = date_str.strip()
     if s.lower() in ('present', 'now'):
         return datetime.now()
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(s, fmt)
-        except ValueError:
-            continue
-    raise ValueError(f"Unknown date format: {date_str}")
+    fmt = _date_format(s)
+    if fmt is None:
+        raise ValueError(f"Unknown date format: {date_str}")
+    return datetime.strptime(s, fmt)
 
 
 def extract_contact_info(text: str) -> dict:
     """Extract email, phone, GitHub, LinkedIn from text."""
     contact = {}
-    email = re.search(r'[\w\.-]+@[\w\.-]+', text)
+    email = EMAIL_RE.search(text)
     if email:
         contact['email'] = email.group()
-    phone = re.search(r'(?:\+\d{1,3}[\s-]?)?\d{10,15}', text)
+    phone = PHONE_RE.search(text)
     if phone:
         contact['phone'] = phone.group()
-    github = re.search(r'github\.com/\S+', text, re.IGNORECASE)
+    github = GITHUB_RE.search(text)
     if github:
         contact['github'] = github.group()
-    linkedin = re.search(r'linkedin\.com/\S+', text, re.IGNORECASE)
+    linkedin = LINKEDIN_RE.search(text)
     if linkedin:
         contact['linkedin'] = linkedin.group()
     return contact
@@ -49,18 +87,12 @@ def extract_experience(text: str) -> list[dict]:
     """Extract experience details including dates, roles, companies."""
     if not text:
         return []
-    date_pattern = re.compile(
-        r'(?P<start>(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|[A-Za-z]{3,}\.? ?\d{4}|\d{4}[/-]\d{2}))'
-        r'\s*(?:-|–|—|to)\s*'
-        r'(?P<end>(?:\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|Present|Now|[A-Za-z]{3,}\.? ?\d{4}|\d{4}[/-]\d{2}))',
-        re.IGNORECASE
-    )
     entries = []
     for line in text.splitlines():
         seg = line.strip()
         if not seg:
             continue
-        for m in date_pattern.finditer(seg):
+        for m in DATE_RANGE_RE.finditer(seg):
             try:
                 start_date = parse_date(m.group('start'))
                 end_date = parse_date(m.group('end'))
@@ -68,9 +100,9 @@ def extract_experience(text: str) -> list[dict]:
                 continue
             duration = (end_date - start_date).days / 365
             label_part = seg[m.end():].strip() or seg[:m.start()].strip()
-            label_clean = re.split(r'During|Business|Website|Key|As', label_part)[0].strip(' -–—:')
-            label_clean = re.sub(r'^[a-z]+(?:\s+[a-z]+)*,\s*', '', label_clean)
-            rc = re.match(r'(?P<role>.+?)\s+at\s+(?P<company>.+)', label_clean, re.IGNORECASE)
+            label_clean = LABEL_SPLIT_RE.split(label_part)[0].strip(' -–—:')
+            label_clean = LEADING_LOWER_RE.sub('', label_clean)
+            rc = ROLE_COMPANY_RE.match(label_clean)
             if rc:
                 role, company = rc.group('role').strip(), rc.group('company').strip()
             else:
@@ -85,40 +117,43 @@ def extract_experience(text: str) -> list[dict]:
     return entries
 
 
+def _split_sections(text: str) -> dict[str, str]:
+    """Split text into Education/Experience/Skills/Projects sections in a single scan.
+
+    Each section starts after the first occurrence of its header and runs until the next
+    header of a different section. Keys are lower-case section names.
+    """
+    matches = [(m.start(), m.end(), m.group(1).lower()) for m in HEADER_RE.finditer(text)]
+    sections = {}
+    for i, (_, end, name) in enumerate(matches):
+        if name in sections:
+            continue
+        stop = next((start for start, _, other in matches[i + 1:] if other != name), len(text))
+        sections[name] = text[end:stop].strip()
+    return sections
+
+
 def extract_by_keywords(text: str, keyword: str) -> str:
     """Extract specific sections like Education, Experience, Skills, Projects."""
-    sections = ['Education', 'Experience', 'Skills', 'Projects']
-    pat = re.compile(rf'{keyword}', re.IGNORECASE)
-    m = pat.search(text)
-    if not m:
-        return ''
-    start = m.end()
-    end = len(text)
-    for sec in sections:
-        if sec.lower() == keyword.lower():
-            continue
-        m2 = re.search(rf'{sec}', text[start:], re.IGNORECASE)
-        if m2:
-            end = start + m2.start()
-            break
-    return text[start:end].strip()
+    return _split_sections(text).get(keyword.lower(), '')
 
 
 def extract_structured_fields(text: str) -> dict:
     """Extract all structured information from resume text."""
+    sections = _split_sections(text)
     data = {
         'contact': extract_contact_info(text),
-        'education': extract_by_keywords(text, 'Education'),
-        'experience': extract_by_keywords(text, 'Experience'),
-        'skills': extract_by_keywords(text, 'Skills'),
-        'projects': extract_by_keywords(text, 'Projects'),
+        'education': sections.get('education', ''),
+        'experience': sections.get('experience', ''),
+        'skills': sections.get('skills', ''),
+        'projects': sections.get('projects', ''),
     }
     data['experience_details'] = extract_experience(data['experience'])
     return data
 
 
 def generate_experience_image(experience_data) -> str | None:
-    """Generate and display a timeline image of experiences with all extracted dates on the X-axis."""
+    """Generate a base64 PNG timeline of experiences with all extracted dates on the X-axis."""
     if isinstance(experience_data, str):
         entries = extract_experience(experience_data)
     else:
@@ -143,36 +178,34 @@ def generate_experience_image(experience_data) -> str | None:
     for job in jobs:
         job['start_num'], job['end_num'] = mdates.date2num(job['start']), mdates.date2num(job['end'])
 
-    fig, ax = plt.subplots(figsize=(14, 6))
-    for idx, job in enumerate(jobs):
-        ax.plot([job['start_num'], job['end_num']], [idx, idx], marker='o', linewidth=4)
-
-    ax.set_yticks(range(len(jobs)))
-    ax.set_yticklabels([job['title'] for job in jobs], fontsize=12)
-
-    # generate monthly ticks between min and max date
-    min_date = min(job['start'] for job in jobs)
-    max_date = max(job['end'] for job in jobs)
-    monthly = pd.date_range(start=min_date, end=max_date, freq='MS')
-    tick_nums = mdates.date2num(monthly.to_pydatetime())
-    ax.set_xticks(tick_nums)
-    ax.set_xticklabels([d.strftime('%b %Y') for d in monthly], rotation=45, ha='right')
-
-    ax.xaxis.set_minor_locator(mdates.DayLocator(interval=15))
-    ax.grid(axis='x', which='major', linestyle='--', alpha=0.6)
-
-    ax.set_xlim(min(tick_nums) - 10, max(tick_nums) + 10)
-    ax.set_xlabel("Date", fontsize=14)
-    ax.set_title("Job Experience Timeline", fontsize=18, fontweight='bold')
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-    plt.tight_layout()
-
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight')
-    buf.seek(0)
-    plt.show()
-
-    total_years = sum((job['end'] - job['start']).days for job in jobs) / 365
-    print(f"\nOverall Experience: {total_years:.1f} years\n")
+    with _TIMELINE_LOCK:
+        fig, ax = _timeline_axes()
+        ax.clear()
+        for idx, job in enumerate(jobs):
+            ax.plot([job['start_num'], job['end_num']], [idx, idx], marker='o', linewidth=4)
+
+        ax.set_yticks(range(len(jobs)))
+        ax.set_yticklabels([job['title'] for job in jobs], fontsize=12)
+
+        # generate monthly ticks between min and max date
+        min_date = min(job['start'] for job in jobs)
+        max_date = max(job['end'] for job in jobs)
+        monthly = pd.date_range(start=min_date, end=max_date, freq='MS')
+        tick_nums = mdates.date2num(monthly)
+        ax.set_xticks(tick_nums)
+        ax.set_xticklabels([d.strftime('%b %Y') for d in monthly], rotation=45, ha='right')
+
+        ax.xaxis.set_minor_locator(mdates.DayLocator(interval=15))
+        ax.grid(axis='x', which='major', linestyle='--', alpha=0.6)
+
+        ax.set_xlim(min(tick_nums) - 10, max(tick_nums) + 10)
+        ax.set_xlabel("Date", fontsize=14)
+        ax.set_title("Job Experience Timeline", fontsize=18, fontweight='bold')
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        fig.tight_layout()
+
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight')
+        buf.seek(0)
     return base64.b64encode(buf.read()).decode('utf-8')
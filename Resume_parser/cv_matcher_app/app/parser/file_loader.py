@@ -1,13 +1,60 @@
 # File type handling (PDF/DOCX)
 # file_loader.py
 
-from pdfminer.high_level import extract_text
+import hashlib
+import os
+import tempfile
+from importlib.metadata import version
+import pymupdf
+
+# Extracted text is cached here, keyed by the extractor and the SHA-256 of the file contents
+TEXT_CACHE_DIR = '.text_cache'
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx')
+
+def extractor_id(path):
+    """
+    Name and version of the library that extracts text for this file type.
+    """
+    if path.lower().endswith(".docx"):
+        return f'docx2txt-{version("docx2txt")}'
+    return f'pymupdf-{pymupdf.VersionBind}'
+
+def extract_raw_text(path):
+    """
+    Extract text from a PDF (PyMuPDF) or DOCX (docx2txt) file without caching.
+    """
+    lower = path.lower()
+    if lower.endswith(".pdf"):
+        with pymupdf.open(path) as doc:
+            return '\n'.join(page.get_text('text') for page in doc)
+    if lower.endswith(".docx"):
+        import docx2txt
+        return docx2txt.process(path)
+    raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
 
 def load_file(path):
     """
-    Load text from a PDF file. Extend this for DOCX etc.
+    Load text from a PDF or DOCX file.
+    Extraction results are cached on disk per file hash.
     """
-    if path.lower().endswith(".pdf"):
-        return extract_text(path)
-    else:
-        raise ValueError("Unsupported file format. Only PDF is supported.")
+    if not path.lower().endswith(SUPPORTED_EXTENSIONS):
+        raise ValueError("Unsupported file format. Only PDF and DOCX are supported.")
+    with open(path, 'rb') as f:
+        key = hashlib.sha256(f.read()).hexdigest()
+    cache_path = os.path.join(TEXT_CACHE_DIR, extractor_id(path), key + '.txt')
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    text = extract_raw_text(path)
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Write to a temp file and rename it into place so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return text
@@ -2,25 +2,20 @@
 # utils.py
 
 import re
-import nltk
-from nltk.tokenize import sent_tokenize
 
-# Ensure punkt tokenizer is downloaded
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+# Sentence boundary: terminal punctuation, whitespace, then an upper-case letter
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
 
 def clean_text(text):
     """
     Remove extra whitespace and fix encoding issues.
     """
-    text = re.sub(r'\s+', ' ', text)          # collapse multiple spaces
-    text = text.replace('\x0c', '')           # remove form feed char
-    return text.strip()
+    # str.split() treats form feeds and all other whitespace as separators,
+    # so one C-level split/join collapses runs and trims the ends
+    return ' '.join(text.split())
 
 def split_sentences(text):
     """
     Split text into sentences.
     """
-    return sent_tokenize(text)
+    return _SENT_SPLIT.split(text) if text else []
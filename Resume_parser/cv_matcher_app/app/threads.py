@@ -0,0 +1,12 @@
+# CPU sizing helpers; dependency-free so run.py can use them before numpy/torch load
+# threads.py
+
+import os
+
+def available_cpus() -> int:
+    """
+    Number of CPUs this process may run on (respects affinity masks such as container cpusets).
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -1,5 +1,11 @@
-import streamlit as st
 import os
+from app.threads import available_cpus
+
+# Size the OpenMP/MKL pools to the CPUs this process may use before numpy or torch load
+os.environ.setdefault('OMP_NUM_THREADS', str(available_cpus()))
+os.environ.setdefault('MKL_NUM_THREADS', str(available_cpus()))
+
+import streamlit as st
 from app.parser.cv_preprocessor import preprocess_cv
 from app.parser.cv_structured_parser import extract_structured_fields
 from app.matching.semantic_matcher import SemanticScorer
@@ -11,7 +17,13 @@ from datetime import datetime
 import pandas as pd
 
 # Initialize
-scorer = SemanticScorer()
+@st.cache_resource(show_spinner=False)
+def load_scorer():
+    """Build the scorer once per process so its model and embedding cache survive reruns."""
+    return SemanticScorer(num_threads=available_cpus())
+
+
+scorer = load_scorer()
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 
@@ -21,6 +33,22 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+@st.cache_data(show_spinner=False)
+def parse_cv(file_bytes: bytes, filename: str) -> dict:
+    """Save, load and parse an uploaded CV; cached on its contents so reruns skip PDF extraction."""
+    filepath = os.path.join(UPLOAD_FOLDER, filename)
+    with open(filepath, "wb") as f:
+        f.write(file_bytes)
+    cv_data = preprocess_cv(filepath)
+    return extract_structured_fields(cv_data.get("cleaned_text", ""))
+
+
+@st.cache_data(show_spinner=False)
+def parse_jd(text: str) -> dict:
+    """Extract structured fields from the job description text (cached per text)."""
+    return extract_structured_fields(text)
+
+
 def plot_experience_timeline(experience_data):
     """Plot the job experience timeline with monthly ticks for Streamlit."""
     if not experience_data:
@@ -56,7 +84,7 @@ def plot_experience_timeline(experience_data):
     min_date = min(start for _, start, _ in jobs)
     max_date = max(end for _, _, end in jobs)
     monthly = pd.date_range(start=min_date, end=max_date, freq='MS')
-    tick_nums = mdates.date2num(monthly.to_pydatetime())
+    tick_nums = mdates.date2num(monthly)
     ax.set_xticks(tick_nums)
     ax.set_xticklabels([d.strftime('%b %Y') for d in monthly], rotation=45, ha='right')
     ax.xaxis.set_minor_locator(mdates.DayLocator(interval=15))
@@ -81,20 +109,15 @@ jd_text = st.sidebar.text_area("Paste the Job Description here:")
 
 if uploaded_file and jd_text:
     if allowed_file(uploaded_file.name):
-        filepath = os.path.join(UPLOAD_FOLDER, uploaded_file.name)
-        with open(filepath, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-
         with st.spinner("Processing CV..."):
-            cv_data = preprocess_cv(filepath)
-            cv_text = cv_data.get("cleaned_text", "")
-            structured_cv_data = extract_structured_fields(cv_text)
-            jd_structured = extract_structured_fields(jd_text)
+            structured_cv_data = parse_cv(uploaded_file.getvalue(), uploaded_file.name)
+            jd_structured = parse_jd(jd_text)
 
             match_result = scorer.score_cv(structured_cv_data, jd_structured)
             missing_keywords = scorer.find_missing_keywords(structured_cv_data, jd_structured)
             wordcloud_base64 = scorer.generate_word_cloud(missing_keywords)
-            shap_base64 = scorer.explain_score(structured_cv_data, jd_structured)
+            section_sims = [match_result[f"{sec}_similarity"] for sec in scorer.SECTIONS]
+            shap_base64 = scorer.explain_score(structured_cv_data, jd_structured, sims=section_sims)
             experience_fig = plot_experience_timeline(structured_cv_data.get('experience_details', []))
 
         st.success("✅ Matching Completed!")
@@ -130,6 +153,7 @@ if uploaded_file and jd_text:
         if experience_fig:
             st.subheader("🛤️ Experience Timeline")
             st.pyplot(experience_fig)
+            plt.close(experience_fig)  # release the pyplot figure; a new one is built per rerun
 
         st.subheader("🗂️ Structured CV Data")
         st.write(structured_cv_data)
@@ -0,0 +1,82 @@
+import sys
+import os
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.parser.cv_structured_parser import _split_sections, extract_structured_fields, parse_date
+
+
+@pytest.mark.parametrize('date_str, expected', [
+    ('2020-01-05', datetime(2020, 1, 5)),  # %Y-%m-%d
+    ('2020/1/5', datetime(2020, 1, 5)),  # %Y/%m/%d
+    ('2020-03', datetime(2020, 3, 1)),  # %Y-%m
+    ('2020/03', datetime(2020, 3, 1)),  # %Y/%m
+    ('05-01-2020', datetime(2020, 1, 5)),  # %d-%m-%Y
+    ('5/1/2020', datetime(2020, 1, 5)),  # %d/%m/%Y
+    ('Jan 2020', datetime(2020, 1, 1)),  # %b %Y
+    ('May 2021', datetime(2021, 5, 1)),  # %b %Y
+    ('January 2020', datetime(2020, 1, 1)),  # %B %Y
+    (' March 2021 ', datetime(2021, 3, 1)),
+])
+def test_parse_date_supported_formats(date_str, expected):
+    assert parse_date(date_str) == expected
+
+
+@pytest.mark.parametrize('date_str', ['Present', 'now'])
+def test_parse_date_present(date_str):
+    assert abs((datetime.now() - parse_date(date_str)).total_seconds()) < 5
+
+
+@pytest.mark.parametrize('date_str', [
+    'Sept 2020', 'Jan. 2020', '01-2020', '15/01/20', 'Jan2020', '2020-01/05', '2020-13',
+])
+def test_parse_date_rejects_unsupported_shapes(date_str):
+    with pytest.raises(ValueError):
+        parse_date(date_str)
+
+
+def test_headers_split_in_order():
+    text = ("John Doe EDUCATION BSc CS 2019 Experience Engineer at X Jan 2020 - Present "
+            "Skills Python, SQL PROJECTS Resume matcher")
+    sections = _split_sections(text)
+    assert sections == {
+        'education': 'BSc CS 2019',
+        'experience': 'Engineer at X Jan 2020 - Present',
+        'skills': 'Python, SQL',
+        'projects': 'Resume matcher',
+    }
+
+
+def test_lowercase_headers_in_job_description_prose():
+    text = ("We want strong experience in machine learning. "
+            "Required skills: python, pytorch, sql. education: BSc in CS")
+    sections = _split_sections(text)
+    assert sections == {
+        'experience': 'in machine learning. Required',
+        'skills': ': python, pytorch, sql.',
+        'education': ': BSc in CS',
+    }
+
+
+def test_header_suffix_is_consumed():
+    sections = _split_sections("Experienced engineer at X EDUCATIONAL BACKGROUND MSc Skillset Python")
+    assert sections['experience'] == 'engineer at X'
+    assert sections['education'] == 'BACKGROUND MSc'
+    assert sections['skills'] == 'Python'
+
+
+def test_repeated_header_does_not_truncate_own_section():
+    sections = _split_sections("Experience Engineer. Experience with Python. Skills Go")
+    assert sections['experience'] == 'Engineer. Experience with Python.'
+
+
+def test_missing_sections_are_empty_strings():
+    data = extract_structured_fields("Skills Python")
+    assert data['skills'] == 'Python'
+    assert data['education'] == ''
+    assert data['experience'] == ''
+    assert data['projects'] == ''
+    assert data['experience_details'] == []
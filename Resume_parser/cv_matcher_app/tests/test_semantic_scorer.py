@@ -0,0 +1,101 @@
+import sys
+import os
+import base64
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.matching import semantic_matcher
+from app.matching.semantic_matcher import CachedEmbedder, SemanticScorer
+
+
+class StubModel:
+    """Deterministic stand-in for SentenceTransformer that records every encode batch."""
+
+    def __init__(self, model_name):
+        self.calls = []
+
+    def eval(self):
+        return self
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        return np.array([[float(len(t)), float(sum(map(ord, t)))] for t in texts])
+
+
+def stub_vector(text):
+    return [float(len(text)), float(sum(map(ord, text)))]
+
+
+@pytest.fixture
+def make_embedder(monkeypatch):
+    monkeypatch.setattr(semantic_matcher, 'SentenceTransformer', StubModel)
+
+    def make(**kwargs):
+        embedder = CachedEmbedder('stub-model', quantize=False, use_onnx=False, **kwargs)
+        embedder.model.calls.clear()  # drop the warmup call
+        return embedder
+    return make
+
+
+@pytest.fixture
+def scorer(monkeypatch):
+    # The SHAP path only needs the weights, so skip loading the transformer
+    monkeypatch.setattr(semantic_matcher, 'CachedEmbedder', lambda *a, **k: SimpleNamespace(model=None))
+    return SemanticScorer()
+
+
+def test_shap_values_closed_form(scorer):
+    sims = np.array([0.8, 0.5, 0.2])
+    phi = scorer.shap_values(sims)
+    np.testing.assert_allclose(phi, scorer._w * (sims - 1 / 3))
+    np.testing.assert_allclose(phi, [0.4 * (0.8 - 1 / 3), 0.3 * (0.5 - 1 / 3), 0.15 * (0.2 - 1 / 3)])
+
+
+def test_explain_score_returns_png(scorer):
+    png_b64 = scorer.explain_score({}, {}, sims=[0.8, 0.5, 0.2])
+    assert base64.b64decode(png_b64).startswith(b'\x89PNG\r\n\x1a\n')
+
+
+def test_embedder_encodes_only_misses(make_embedder):
+    embedder = make_embedder()
+    embedder.encode(['python', 'sql'])
+    embedder.model.calls.clear()
+    embs = embedder.encode(['sql', 'docker'])
+    assert embedder.model.calls == [['docker']]
+    np.testing.assert_array_equal(embs, [stub_vector('sql'), stub_vector('docker')])
+
+
+def test_embedder_encodes_duplicates_once_and_keeps_row_order(make_embedder):
+    embedder = make_embedder()
+    embs = embedder.encode(['b', 'a', 'b', 'c'])
+    assert embedder.model.calls == [['b', 'a', 'c']]
+    np.testing.assert_array_equal(embs, [stub_vector(t) for t in ['b', 'a', 'b', 'c']])
+
+
+def test_embedder_evicts_least_recently_used(make_embedder):
+    embedder = make_embedder(max_size=2)
+    embedder.encode(['a'])
+    embedder.encode(['b'])
+    embedder.encode(['a'])  # refresh 'a' so 'b' is now the oldest
+    embedder.encode(['c'])
+    assert list(embedder._cache) == [embedder._key('a'), embedder._key('c')]
+
+
+def test_embedder_key_includes_backend(make_embedder):
+    embedder = make_embedder()
+    fp32_key = embedder._key('python')
+    embedder.backend = 'torch-int8'
+    assert embedder._key('python') != fp32_key
+
+
+def test_embedder_disk_mirror_serves_new_instance(make_embedder, tmp_path):
+    pytest.importorskip('diskcache')
+    make_embedder(cache_dir=str(tmp_path)).encode(['python'])
+    fresh = make_embedder(cache_dir=str(tmp_path))
+    embs = fresh.encode(['python'])
+    assert fresh.model.calls == []
+    np.testing.assert_array_equal(embs, [stub_vector('python')])